@@ -0,0 +1,30 @@
+"""
+ОТМЕТКА ОБ УСПЕШНОЙ ПРОВЕРКЕ ЗАВИСИМОСТЕЙ
+Общая для main.py и main2.py. Только стандартная библиотека:
+модуль импортируется до проверки зависимостей.
+"""
+
+import os
+import sys
+
+
+def _stamp_text(packages):
+    """Содержимое отметки: путь интерпретатора и список пакетов"""
+    return f"{sys.executable}\n{packages!r}"
+
+
+def is_verified(stamp_file, packages):
+    """Проверяет, что отметка новее интерпретатора и записана для него же и тех же пакетов"""
+    try:
+        return (stamp_file.stat().st_mtime > os.path.getmtime(sys.executable)
+                and stamp_file.read_text() == _stamp_text(packages))
+    except OSError:
+        return False
+
+
+def mark_verified(stamp_file, packages):
+    """Записывает отметку; если записать не удалось, проверка просто повторится"""
+    try:
+        stamp_file.write_text(_stamp_text(packages))
+    except OSError:
+        pass
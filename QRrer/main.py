@@ -8,38 +8,57 @@ import os
 import sys
 import subprocess
 import importlib.metadata
+import importlib.util
 from pathlib import Path
+from deps_stamp import is_verified, mark_verified
 
 class DependencyManager:
     """Менеджер зависимостей"""
     
     REQUIRED_PACKAGES = {
         'qrcode': '7.4.2',
+        'segno': '1.5.2',
         'Pillow': '9.0.0',
+        'numpy': '1.21.0',
         'vobject': '0.9.6'
     }
     
+    # Имена модулей, отличающиеся от имени пакета в pip
+    IMPORT_NAMES = {'Pillow': 'PIL'}
+    
+    # Отметка об успешной проверке: пока она новее интерпретатора, записана
+    # для него же и список пакетов не менялся, проверка при запуске пропускается
+    STAMP_FILE = Path(__file__).with_name('.deps_ok')
+    
     @classmethod
     def check_dependencies(cls):
         """Проверяет и устанавливает зависимости"""
+        if is_verified(cls.STAMP_FILE, cls.REQUIRED_PACKAGES):
+            return
+        
         missing_packages = []
         
         print("🔍 Проверка зависимостей...")
         
         for package, required_version in cls.REQUIRED_PACKAGES.items():
+            if importlib.util.find_spec(cls.IMPORT_NAMES.get(package, package)) is None:
+                print(f"❌ {package}: не установлен")
+                missing_packages.append(package)
+                continue
+            
             try:
                 installed_version = importlib.metadata.version(package)
-                print(f"✅ {package}: {installed_version} (требуется: {required_version}+)")
-                
             except importlib.metadata.PackageNotFoundError:
-                print(f"❌ {package}: не установлен")
-                missing_packages.append(package)
+                installed_version = "?"
+            print(f"✅ {package}: {installed_version} (требуется: {required_version}+)")
         
         if missing_packages:
             print(f"\n📦 Установка недостающих пакетов: {', '.join(missing_packages)}")
             cls.install_packages(missing_packages)
         else:
             print("\n✅ Все зависимости установлены!")
+        
+        mark_verified(cls.STAMP_FILE, cls.REQUIRED_PACKAGES)
     
     @classmethod
     def install_packages(cls, packages):
@@ -58,24 +77,431 @@ class DependencyManager:
 DependencyManager.check_dependencies()
 
 import qrcode
-from PIL import Image, ImageDraw, ImageFont
+import numpy as np
+from PIL import Image, ImageColor, ImageDraw, ImageFont
 import json
+import struct
+import zlib
+import functools
+from io import BytesIO
 from datetime import datetime
+from urllib.parse import quote as _quote
+
+# Предпочитаемый движок кодирования: segno заметно быстрее qrcode
+# на больших версиях. qrcode остается запасным вариантом.
+try:
+    import segno
+except ImportError:
+    segno = None
+
+# Таблицы GF(256) (примитивный многочлен 0x11D), строятся один раз при импорте
+GF_EXP = [0] * 512
+GF_LOG = [0] * 256
+
+_value = 1
+for _i in range(255):
+    GF_EXP[_i] = GF_EXP[_i + 255] = _value
+    GF_LOG[_value] = _i
+    _value <<= 1
+    if _value & 0x100:
+        _value ^= 0x11D
+
+
+def _generator_poly(nsym):
+    """Порождающий многочлен (x - a^0)(x - a^1)...(x - a^(nsym-1))"""
+    poly = [1]
+    for i in range(nsym):
+        poly = [high ^ (GF_EXP[GF_LOG[low] + i] if low else 0)
+                for high, low in zip(poly + [0], [0] + poly)]
+    return tuple(GF_LOG[coef] for coef in poly[1:])
+
+
+# Порождающие многочлены Рида-Соломона для всех длин блоков коррекции
+# в виде логарифмов коэффициентов (без старшей единицы). Нужны только
+# запасному кодировщику qrcode и заполняются в _init_fallback.
+GEN_POLY = {}
+
+_DATA_POSITIONS = {}  # версия -> координаты модулей данных в порядке зигзага
+_MASK_BITS = {}       # (версия, маска) -> инверсия для каждой позиции данных
+
+
+def _rs_remainder(data, gen_log):
+    """Байты коррекции: остаток от деления данных на порождающий многочлен"""
+    remainder = [0] * len(gen_log)
+    for byte in data:
+        coef = byte ^ remainder.pop(0)
+        remainder.append(0)
+        if coef:
+            shift = GF_LOG[coef]
+            for j, log in enumerate(gen_log):
+                remainder[j] ^= GF_EXP[log + shift]
+    return remainder
+
+
+def _rs_encode(msg, gen, gf_exp, gf_log):
+    """Вариант _rs_remainder на массивах NumPy для компиляции numba"""
+    nsym = len(gen)
+    out = np.zeros(len(msg) + nsym, dtype=np.uint8)
+    out[:len(msg)] = msg
+    for i in range(len(msg)):
+        coef = out[i]
+        if coef:
+            shift = gf_log[coef]
+            for j in range(nsym):
+                out[i + 1 + j] ^= gf_exp[gen[j] + shift]
+    return out[len(msg):]
+
+
+# Numba (если установлен) компилирует _rs_encode для qrcode. Импорт numba
+# долгий, поэтому он откладывается до первого кодирования через qrcode.
+_rs_encode_jit = None
+_GF_EXP_ARRAY = np.array(GF_EXP, dtype=np.int32)
+_GF_LOG_ARRAY = np.array(GF_LOG, dtype=np.int32)
+_GEN_POLY_ARRAYS = {}
+
+
+def _create_bytes(buffer, rs_blocks):
+    """Замена qrcode.util.create_bytes на табличном Рида-Соломоне"""
+    offset = 0
+    dcdata = []
+    ecdata = []
+    
+    for rs_block in rs_blocks:
+        dc_count = rs_block.data_count
+        ec_count = rs_block.total_count - dc_count
+        
+        current_dc = [0xFF & byte for byte in buffer.buffer[offset:offset + dc_count]]
+        offset += dc_count
+        
+        if _rs_encode_jit is None:
+            current_ec = _rs_remainder(current_dc, GEN_POLY[ec_count])
+        else:
+            current_ec = _rs_encode_jit(
+                np.array(current_dc, dtype=np.uint8), _GEN_POLY_ARRAYS[ec_count],
+                _GF_EXP_ARRAY, _GF_LOG_ARRAY
+            ).tolist()
+        
+        dcdata.append(current_dc)
+        ecdata.append(current_ec)
+    
+    # Перемежаем блоки: сначала данные, затем коррекция
+    data = []
+    for blocks in (dcdata, ecdata):
+        for i in range(max(map(len, blocks))):
+            for block in blocks:
+                if i < len(block):
+                    data.append(block[i])
+    
+    return data
+
+
+def _init_fallback():
+    """Готовит qrcode к первому кодированию: многочлены, numba и create_bytes.
+    
+    Вызывается только при кодировании через qrcode, поэтому основной путь
+    через segno не зависит от внутренних таблиц и функций qrcode.
+    """
+    for block in qrcode.base.RS_BLOCK_TABLE:
+        for j in range(0, len(block), 3):
+            nsym = block[j + 1] - block[j + 2]
+            if nsym not in GEN_POLY:
+                GEN_POLY[nsym] = _generator_poly(nsym)
+    
+    global _rs_encode_jit
+    try:
+        from numba import njit
+    except ImportError:
+        pass
+    else:
+        _GEN_POLY_ARRAYS.update(
+            (nsym, np.array(gen, dtype=np.int32)) for nsym, gen in GEN_POLY.items()
+        )
+        _rs_encode_jit = njit(cache=True, nogil=True)(_rs_encode)
+    
+    qrcode.util.create_bytes = _create_bytes
+
+
+def _zigzag_positions(modules):
+    """Свободные (None) модули в порядке раскладки данных"""
+    count = len(modules)
+    positions = []
+    inc = -1
+    row = count - 1
+    
+    for col in range(count - 1, 0, -2):
+        if col <= 6:
+            col -= 1
+        
+        while True:
+            for c in (col, col - 1):
+                if modules[row][c] is None:
+                    positions.append((row, c))
+            
+            row += inc
+            if row < 0 or count <= row:
+                row -= inc
+                inc = -inc
+                break
+    
+    return tuple(positions)
+
+
+# Подбор маски для qrcode на упакованных строках: каждая строка и столбец
+# матрицы хранятся как int (бит i = модуль i), маски накладываются XOR,
+# а штрафные правила считаются побитовыми операциями сразу по всей строке.
+_MASK_LINES = {}  # версия -> [(строки, столбцы) для каждой из 8 масок]
+
+# Шаблоны 1:1:3:1:1 со светлой зоной в 4 модуля (правило 3)
+_FINDER_LIKE_PATTERNS = (
+    (1, 0, 1, 1, 1, 0, 1, 0, 0, 0, 0),
+    (0, 0, 0, 0, 1, 0, 1, 1, 1, 0, 1),
+)
+
+
+def _pack(bits):
+    """Упаковывает последовательность модулей в int (бит i = модуль i)"""
+    value = 0
+    for i, bit in enumerate(bits):
+        if bit:
+            value |= 1 << i
+    return value
+
+
+def _popcount(value):
+    """Количество единичных битов"""
+    return bin(value).count('1')
+
+
+def _mask_lines(modules):
+    """Упаковывает 8 масок, ограниченных свободными (None) модулями"""
+    count = len(modules)
+    lines = []
+    for pattern in range(8):
+        mask_func = qrcode.util.mask_func(pattern)
+        grid = [[modules[r][c] is None and mask_func(r, c) for c in range(count)]
+                for r in range(count)]
+        lines.append(([_pack(row) for row in grid], [_pack(col) for col in zip(*grid)]))
+    return lines
+
+
+def _lost_point_packed(rows, cols, count):
+    """Штрафные баллы маски (те же правила, что qrcode.util.lost_point)"""
+    lost_point = 0
+    run_mask = (1 << (count - 4)) - 1
+    pair_mask = (1 << (count - 1)) - 1
+    pattern_mask = (1 << (count - 10)) - 1
+    
+    for line in rows + cols:
+        # Правило 1: серия из L >= 5 одинаковых модулей дает L - 2 балла.
+        # Бит i в runs означает, что модули i..i+4 одного цвета.
+        same = ~(line ^ (line >> 1))
+        runs = same & (same >> 1) & (same >> 2) & (same >> 3) & run_mask
+        if runs:
+            lost_point += _popcount(runs) + 2 * _popcount(runs & ~(runs << 1))
+        
+        # Правило 3: шаблоны, похожие на поисковый узор
+        for pattern in _FINDER_LIKE_PATTERNS:
+            found = pattern_mask
+            for shift, dark in enumerate(pattern):
+                found &= (line if dark else ~line) >> shift
+                if not found:
+                    break
+            lost_point += 40 * _popcount(found)
+    
+    # Правило 2: блоки 2x2 одного цвета
+    for upper, lower in zip(rows, rows[1:]):
+        same = ~(upper ^ lower)
+        blocks = same & (same >> 1) & ~(upper ^ (upper >> 1)) & pair_mask
+        lost_point += 3 * _popcount(blocks)
+    
+    # Правило 4: отклонение доли темных модулей от 50%
+    dark_count = sum(map(_popcount, rows))
+    percent = float(dark_count) / (count ** 2)
+    lost_point += int(abs(percent * 100 - 50) / 5) * 10
+    
+    return lost_point
+
+
+class _PackedQRCode(qrcode.QRCode):
+    """qrcode.QRCode с подбором маски по упакованным строкам"""
+    
+    def map_data(self, data, mask_pattern):
+        # До раскладки данных свободные модули еще равны None
+        positions = _DATA_POSITIONS.get(self.version)
+        if positions is None:
+            positions = _DATA_POSITIONS[self.version] = _zigzag_positions(self.modules)
+            _MASK_LINES[self.version] = _mask_lines(self.modules)
+        
+        mask_bits = _MASK_BITS.get((self.version, mask_pattern))
+        if mask_bits is None:
+            mask_func = qrcode.util.mask_func(mask_pattern)
+            mask_bits = tuple(bool(mask_func(row, col)) for row, col in positions)
+            _MASK_BITS[(self.version, mask_pattern)] = mask_bits
+        
+        modules = self.modules
+        data_len = len(data)
+        for index, (row, col) in enumerate(positions):
+            byte_index = index >> 3
+            dark = byte_index < data_len and (data[byte_index] >> (7 - (index & 7))) & 1 == 1
+            modules[row][col] = dark != mask_bits[index]
+    
+    def best_mask_pattern(self):
+        # Матрица строится один раз; снимаем маску 0 и перебираем все маски XOR
+        self.makeImpl(True, 0)
+        masks = _MASK_LINES[self.version]
+        rows = [_pack(row) ^ mask for row, mask in zip(self.modules, masks[0][0])]
+        cols = [_pack(col) ^ mask for col, mask in zip(zip(*self.modules), masks[0][1])]
+        
+        lost_points = [
+            _lost_point_packed(
+                [row ^ mask for row, mask in zip(rows, mask_rows)],
+                [col ^ mask for col, mask in zip(cols, mask_cols)],
+                self.modules_count
+            )
+            for mask_rows, mask_cols in masks
+        ]
+        return lost_points.index(min(lost_points))
+
+
+# Один экземпляр запасного кодировщика на всю сессию
+_QR_ENCODER = _PackedQRCode(
+    error_correction=qrcode.constants.ERROR_CORRECT_H,
+    border=4,
+)
+
+
+def _make_qr_matrix(data):
+    """Кодирует данные в матрицу модулей (с рамкой в 4 модуля)"""
+    if segno is None:
+        if not GEN_POLY:
+            _init_fallback()
+        
+        # clear() не сбрасывает версию, подбор начинаем заново с первой
+        _QR_ENCODER.clear()
+        _QR_ENCODER.version = 1
+        _QR_ENCODER.add_data(data)
+        _QR_ENCODER.make(fit=True)
+        return _QR_ENCODER.get_matrix()
+    
+    qr = segno.make_qr(data, error='h')
+    return list(qr.matrix_iter(scale=1, border=4))
+
+
+def _png_chunk(chunk_type, data):
+    """Упаковывает данные в чанк PNG (длина, тип, данные, CRC)"""
+    return (struct.pack('>I', len(data)) + chunk_type + data
+            + struct.pack('>I', zlib.crc32(chunk_type + data)))
+
+
+def _encode_png_1bit(modules, fill_rgb, bg_rgb):
+    """Кодирует двухцветную матрицу пикселей в PNG с палитрой 1 бит/пиксель"""
+    height, width = modules.shape
+    
+    # Каждая строка: байт фильтра (0) + пиксели, упакованные по 8 в байт
+    rows = np.packbits(modules, axis=1)
+    raw = np.hstack([np.zeros((height, 1), dtype=np.uint8), rows]).tobytes()
+    
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n',
+        _png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 1, 3, 0, 0, 0)),
+        _png_chunk(b'PLTE', bytes(bg_rgb) + bytes(fill_rgb)),
+        _png_chunk(b'IDAT', zlib.compress(raw)),
+        _png_chunk(b'IEND', b''),
+    ])
+
+
+@functools.lru_cache(maxsize=64)
+def _render_image_bytes(data, fill_rgb, bg_rgb, box_size, image_format):
+    """Кодирует и рисует QR-код, возвращает содержимое файла изображения.
+    
+    Результат кэшируется: повторная генерация с теми же данными и
+    настройками сводится к записи готовых байтов в файл.
+    """
+    modules = np.array(_make_qr_matrix(data), dtype=bool)
+    
+    # Масштабируем матрицу: каждый модуль -> квадрат box_size x box_size
+    modules = modules.repeat(box_size, axis=0).repeat(box_size, axis=1)
+    
+    # PNG пишем сами: изображение двухцветное, хватает палитры из 2 цветов
+    if image_format == 'PNG':
+        return _encode_png_1bit(modules, fill_rgb, bg_rgb)
+    
+    # Остальные форматы: раскрашиваем все пиксели за одну операцию
+    pixels = np.where(modules[..., None],
+                      np.array(fill_rgb, dtype=np.uint8),
+                      np.array(bg_rgb, dtype=np.uint8))
+    
+    buffer = BytesIO()
+    Image.fromarray(pixels, 'RGB').save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+# Пункты меню и пресеты настроек
+_DATA_TYPES = (
+    ('1', '🌐 URL/Ссылка', 'create_url_qr'),
+    ('2', '📝 Текст', 'create_text_qr'),
+    ('3', '📶 WiFi', 'create_wifi_qr'),
+    ('4', '📧 Email', 'create_email_qr'),
+    ('5', '💬 SMS', 'create_sms_qr'),
+    ('6', '👤 vCard (контакт)', 'create_vcard_qr'),
+    ('7', '📍 Геолокация', 'create_geo_qr'),
+    ('8', '📞 Телефон', 'create_phone_qr'),
+    ('9', '📅 Событие', 'create_event_qr'),
+)
+_DATA_TYPE_CHOICES = {key: name for key, name, _ in _DATA_TYPES}
+
+_COLOR_CHOICES = {
+    '1': '⚫ Классический (черный/белый)',
+    '2': '⚪ Инвертированный (белый/черный)',
+    '3': '🔵 Синий',
+    '4': '🟢 Зеленый',
+    '5': '🔴 Красный',
+    '6': '🟣 Фиолетовый',
+    '7': '🎨 Кастомный',
+}
+
+_COLOR_PRESETS = {
+    '1': ('#000000', '#FFFFFF'),
+    '2': ('#FFFFFF', '#000000'),
+    '3': ('#1E40AF', '#EFF6FF'),
+    '4': ('#065F46', '#ECFDF5'),
+    '5': ('#991B1B', '#FEF2F2'),
+    '6': ('#5B21B6', '#FAF5FF'),
+}
+
+# Пресеты сразу в виде (r, g, b), чтобы не разбирать HEX при каждой генерации
+_COLOR_PRESETS_RGB = {
+    key: (ImageColor.getrgb(fill)[:3], ImageColor.getrgb(bg)[:3])
+    for key, (fill, bg) in _COLOR_PRESETS.items()
+}
+
+_SIZE_CHOICES = {
+    '1': '🔲 Маленький',
+    '2': '🔳 Средний',
+    '3': '🔲 Большой',
+    '4': '📏 Кастомный',
+}
+
+_SIZE_PRESETS = {'1': 8, '2': 12, '3': 16}
+
+_CONTINUE_CHOICES = {
+    '1': '🔄 Создать еще один QR-код',
+    '2': '🚪 Выйти из программы',
+}
+
+
+def _rgb_to_hex(rgb):
+    """Переводит (r, g, b) в строку вида #RRGGBB"""
+    return '#%02X%02X%02X' % rgb
+
 
 class QRCodeGenerator:
     """Основной класс генератора QR-кодов"""
     
     def __init__(self):
         self.data_types = {
-            '1': {'name': '🌐 URL/Ссылка', 'handler': self.create_url_qr},
-            '2': {'name': '📝 Текст', 'handler': self.create_text_qr},
-            '3': {'name': '📶 WiFi', 'handler': self.create_wifi_qr},
-            '4': {'name': '📧 Email', 'handler': self.create_email_qr},
-            '5': {'name': '💬 SMS', 'handler': self.create_sms_qr},
-            '6': {'name': '👤 vCard (контакт)', 'handler': self.create_vcard_qr},
-            '7': {'name': '📍 Геолокация', 'handler': self.create_geo_qr},
-            '8': {'name': '📞 Телефон', 'handler': self.create_phone_qr},
-            '9': {'name': '📅 Событие', 'handler': self.create_event_qr}
+            key: {'name': name, 'handler': getattr(self, handler)}
+            for key, name, handler in _DATA_TYPES
         }
     
     def clear_screen(self):
@@ -173,9 +599,9 @@ class QRCodeGenerator:
         email_url = f"mailto:{email}"
         params = []
         if subject:
-            params.append(f"subject={self.url_encode(subject)}")
+            params.append(f"subject={_quote(subject, safe='')}")
         if body:
-            params.append(f"body={self.url_encode(body)}")
+            params.append(f"body={_quote(body, safe='')}")
         
         if params:
             email_url += "?" + "&".join(params)
@@ -194,7 +620,7 @@ class QRCodeGenerator:
         
         sms_url = f"sms:{number}"
         if message:
-            sms_url += f"?body={self.url_encode(message)}"
+            sms_url += f"?body={_quote(message, safe='')}"
         
         filename = self.get_input("Имя файла для сохранения", required=False, default="sms_qr.png")
         
@@ -302,9 +728,14 @@ class QRCodeGenerator:
         
         return event_data, filename
     
-    def url_encode(self, text):
-        """Простое URL кодирование"""
-        return text.replace(' ', '%20').replace('&', '%26')
+    def get_color(self, prompt, default):
+        """Запрашивает цвет в HEX и переводит его в (r, g, b)"""
+        while True:
+            color = self.get_input(prompt, required=False, default=default)
+            try:
+                return ImageColor.getrgb(color)[:3]
+            except ValueError:
+                print("❌ Неверный цвет. Используйте формат #RRGGBB.")
     
     def get_qr_settings(self):
         """Получает настройки для QR-кода"""
@@ -314,49 +745,24 @@ class QRCodeGenerator:
         settings = {}
         
         # Цвета
-        color_choice = self.get_user_choice(
-            {'1': '⚫ Классический (черный/белый)',
-             '2': '⚪ Инвертированный (белый/черный)',
-             '3': '🔵 Синий',
-             '4': '🟢 Зеленый',
-             '5': '🔴 Красный',
-             '6': '🟣 Фиолетовый',
-             '7': '🎨 Кастомный'},
-            "Выберите цветовую схему"
-        )
-        
-        color_presets = {
-            '1': ('#000000', '#FFFFFF'),
-            '2': ('#FFFFFF', '#000000'),
-            '3': ('#1E40AF', '#EFF6FF'),
-            '4': ('#065F46', '#ECFDF5'),
-            '5': ('#991B1B', '#FEF2F2'),
-            '6': ('#5B21B6', '#FAF5FF'),
-        }
+        color_choice = self.get_user_choice(_COLOR_CHOICES, "Выберите цветовую схему")
         
         if color_choice == '7':
-            fill_color = self.get_input("Цвет QR-кода (HEX)", required=False, default="#000000")
-            bg_color = self.get_input("Цвет фона (HEX)", required=False, default="#FFFFFF")
+            fill_color = self.get_color("Цвет QR-кода (HEX)", default="#000000")
+            bg_color = self.get_color("Цвет фона (HEX)", default="#FFFFFF")
         else:
-            fill_color, bg_color = color_presets[color_choice]
+            fill_color, bg_color = _COLOR_PRESETS_RGB[color_choice]
         
         settings['fill_color'] = fill_color
         settings['bg_color'] = bg_color
         
         # Размер
-        size_choice = self.get_user_choice(
-            {'1': '🔲 Маленький',
-             '2': '🔳 Средний',
-             '3': '🔲 Большой',
-             '4': '📏 Кастомный'},
-            "Выберите размер"
-        )
+        size_choice = self.get_user_choice(_SIZE_CHOICES, "Выберите размер")
         
-        size_presets = {'1': 8, '2': 12, '3': 16}
         if size_choice == '4':
             box_size = int(self.get_input("Размер квадрата (6-20)", required=False, default="12"))
         else:
-            box_size = size_presets[size_choice]
+            box_size = _SIZE_PRESETS[size_choice]
         
         settings['box_size'] = box_size
         
@@ -365,31 +771,27 @@ class QRCodeGenerator:
     def generate_qr_code(self, data, filename, settings):
         """Генерирует и сохраняет QR-код"""
         try:
-            # Создаем QR-код
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_H,
-                box_size=settings['box_size'],
-                border=4,
-            )
-            qr.add_data(data)
-            qr.make(fit=True)
+            # Формат файла определяем по расширению, как это делает Pillow
+            image_format = Image.registered_extensions().get(Path(filename).suffix.lower())
+            if image_format is None:
+                raise ValueError(f"неизвестное расширение файла: {filename}")
             
-            # Создаем изображение
-            qr_img = qr.make_image(
-                fill_color=settings['fill_color'],
-                back_color=settings['bg_color']
-            )
-            
-            # Сохраняем
-            qr_img.save(filename)
+            # Создаем изображение (или берем из кэша) и сохраняем
+            Path(filename).write_bytes(_render_image_bytes(
+                data,
+                settings['fill_color'],
+                settings['bg_color'],
+                settings['box_size'],
+                image_format
+            ))
             
             # Показываем информацию о файле
             file_size = os.path.getsize(filename) // 1024
             print(f"\n✅ QR-код успешно создан!")
             print(f"📁 Файл: {filename}")
             print(f"📊 Размер: {file_size} KB")
-            print(f"🎨 Цвета: QR-код {settings['fill_color']}, фон {settings['bg_color']}")
+            print(f"🎨 Цвета: QR-код {_rgb_to_hex(settings['fill_color'])}, "
+                  f"фон {_rgb_to_hex(settings['bg_color'])}")
             
             # Показываем превью в консоли (упрощенное)
             print(f"\n👀 Превью данных: {data[:80]}{'...' if len(data) > 80 else ''}")
@@ -406,9 +808,7 @@ class QRCodeGenerator:
             print("Добро пожаловать в генератор QR-кодов!")
             print("Выберите тип данных для кодирования:\n")
             
-            choice = self.get_user_choice(
-                {key: value['name'] for key, value in self.data_types.items()}
-            )
+            choice = self.get_user_choice(_DATA_TYPE_CHOICES)
             
             # Получаем данные от пользователя
             data, filename = self.data_types[choice]['handler']()
@@ -421,9 +821,7 @@ class QRCodeGenerator:
             
             # Спрашиваем о продолжении
             continue_choice = self.get_user_choice(
-                {'1': '🔄 Создать еще один QR-код',
-                 '2': '🚪 Выйти из программы'},
-                "Что вы хотите сделать дальше?"
+                _CONTINUE_CHOICES, "Что вы хотите сделать дальше?"
             )
             
             if continue_choice == '2':
@@ -8,53 +8,77 @@ import sys
 import subprocess
 import importlib.metadata
 from pathlib import Path
-import base64
-import zlib
+from deps_stamp import is_verified, mark_verified
+import struct
+import getpass
+from io import BytesIO
+from urllib.parse import quote
 from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad, unpad
-from Crypto.Random import get_random_bytes
 import hashlib
+import functools
+from concurrent.futures import ProcessPoolExecutor
 
 class DependencyManager:
     """Менеджер зависимостей"""
     
     REQUIRED_PACKAGES = {
-        'qrcode': '7.4.2',
+        'segno': '1.5.2',
         'Pillow': '9.0.0',
+        'numpy': '1.21.0',
         'vobject': '0.9.6',
-        'pycryptodome': '3.20.0'
+        'pycryptodome': '3.20.0',
+        'pybase64': '1.4',
+        'zstandard': '0.22.0'
     }
     
+    # Отметка об успешной проверке (общая для всех копий программы): пока
+    # она новее интерпретатора, записана для него же и список пакетов
+    # не менялся, проверка при запуске пропускается
+    STAMP_FILE = Path.home() / '.qrrer_deps_ok'
+    
     @classmethod
     def check_dependencies(cls):
         """Проверяет и устанавливает зависимости"""
+        if is_verified(cls.STAMP_FILE, cls.REQUIRED_PACKAGES):
+            return
+        
         missing_packages = []
         
         print("🔍 Проверка зависимостей...")
         
+        # Один проход по установленным пакетам вместо поиска каждого отдельно
+        installed = {
+            dist.metadata['Name'].lower(): dist.version
+            for dist in importlib.metadata.distributions()
+            if dist.metadata['Name']
+        }
+        
         for package, required_version in cls.REQUIRED_PACKAGES.items():
-            try:
-                installed_version = importlib.metadata.version(package)
-                print(f"✅ {package}: {installed_version} (требуется: {required_version}+)")
-                
-            except importlib.metadata.PackageNotFoundError:
+            installed_version = installed.get(package.lower())
+            if installed_version is None:
                 print(f"❌ {package}: не установлен")
                 missing_packages.append(package)
+            else:
+                print(f"✅ {package}: {installed_version} (требуется: {required_version}+)")
         
         if missing_packages:
             print(f"\n📦 Установка недостающих пакетов: {', '.join(missing_packages)}")
             cls.install_packages(missing_packages)
         else:
             print("\n✅ Все зависимости установлены!")
+        
+        mark_verified(cls.STAMP_FILE, cls.REQUIRED_PACKAGES)
     
     @classmethod
     def install_packages(cls, packages):
         """Устанавливает пакеты через pip"""
         try:
-            for package in packages:
-                print(f"📦 Устанавливаю {package}...")
-                subprocess.check_call([sys.executable, "-m", "pip", "install", 
-                                     f"{package}>={cls.REQUIRED_PACKAGES[package]}"])
+            # Один запуск pip на все пакеты: интерпретатор и резолвер
+            # поднимаются один раз
+            print(f"📦 Устанавливаю {', '.join(packages)}...")
+            subprocess.check_call([sys.executable, "-m", "pip", "install",
+                                   *(f"{package}>={cls.REQUIRED_PACKAGES[package]}"
+                                     for package in packages)])
             print("✅ Все пакеты успешно установлены!")
         except subprocess.CalledProcessError as e:
             print(f"❌ Ошибка установки пакетов: {e}")
@@ -63,110 +87,204 @@ class DependencyManager:
 # Импортируем основные библиотеки после проверки зависимостей
 DependencyManager.check_dependencies()
 
-import qrcode
-from PIL import Image, ImageDraw, ImageFont
+import segno
+import numpy as np
+from PIL import Image, ImageColor, ImageDraw, ImageFont
 import json
 from datetime import datetime
+import pybase64
+import zstandard as zstd
+
+# Base64 через pybase64 (SIMD); результат идентичен стандартному base64
+_b64encode = pybase64.b64encode
+
+
+def _b64decode(data):
+    """Декодирует base64 со строгой проверкой алфавита"""
+    return pybase64.b64decode(data, validate=True)
+
+
+# Словарь zstd из типичных фрагментов данных QR-кодов (обвязка JSON,
+# vCard, события, служебные схемы). Короткие данные почти не сжимаются
+# сами по себе, но хорошо сжимаются ссылками на такой словарь
+_ZSTD_DICT = zstd.ZstdCompressionDict(
+    b'{"type": "text_file", "filename": ".txt", "data": "", '
+    b'"timestamp": "2025-01-01T00:00:00.000000"}'
+    b'{"type": "encrypted_image", "algorithm": "AES-256-GCM", "format": "jpeg", "data": ""}'
+    b'BEGIN:VCARD\nVERSION:3.0\nN:;;;;\nFN:\nORG:\nTITLE:\nTEL;TYPE=WORK,VOICE:+7\n'
+    b'EMAIL;TYPE=WORK:@gmail.com\nURL:https://www.\nEND:VCARD'
+    b'BEGIN:VEVENT\nSUMMARY:\nLOCATION:\nDESCRIPTION:\nDTSTART:2025\nDTEND:2025\nEND:VEVENT'
+    b'WIFI:S:;T:WPA;P:;H:true;;mailto:?subject=&body=sms:+7?body=tel:+7'
+    b'geo:55.7558,37.6173https://www.http://.com/',
+    dict_type=zstd.DICT_TYPE_RAWCONTENT
+)
+
+# Маркер формата перед сжатыми данными: сжато со словарем _ZSTD_DICT
+_ZSTD_DICT_MARKER = b'\x01'
+
+# Переиспользуемые контексты zstd: таблицы строятся один раз
+_ZSTD_COMPRESSOR = zstd.ZstdCompressor(level=6, dict_data=_ZSTD_DICT)
+_ZSTD_DICT_DECOMPRESSOR = zstd.ZstdDecompressor(dict_data=_ZSTD_DICT)
+_ZSTD_DECOMPRESSOR = zstd.ZstdDecompressor()
+
+
+@functools.lru_cache(maxsize=8)
+def _derive_key(password):
+    """Ключ AES-256 из пароля (байты); повторные вызовы берутся из кэша"""
+    return hashlib.sha256(password).digest()
+
+
+# Раскладка зашифрованных данных: nonce (12 байт) + тег GCM (16 байт) + шифротекст
+_GCM_NONCE_SIZE = 12
+_GCM_TAG_SIZE = 16
+
+
+def _gcm_encrypt(data, password):
+    """Шифрует байты AES-256-GCM, возвращает nonce + тег + зашифрованные данные"""
+    nonce = os.urandom(_GCM_NONCE_SIZE)
+    cipher = AES.new(_derive_key(password.encode()), AES.MODE_GCM, nonce=nonce)
+    encrypted_data, tag = cipher.encrypt_and_digest(data)
+    return nonce + tag + encrypted_data
+
+
+def _gcm_decrypt(blob, password):
+    """Расшифровывает nonce + тег + данные и проверяет тег"""
+    header = _GCM_NONCE_SIZE + _GCM_TAG_SIZE
+    nonce = blob[:_GCM_NONCE_SIZE]
+    tag = blob[_GCM_NONCE_SIZE:header]
+    cipher = AES.new(_derive_key(password.encode()), AES.MODE_GCM, nonce=nonce)
+    return cipher.decrypt_and_verify(blob[header:], tag)
+
 
 class ImageEncoder:
     """Класс для шифрования и кодирования изображений"""
     
+    # Сигнатура изображения в QR-коде: за ней идут длина (4 байта) и JPEG
+    IMAGE_MAGIC = b'QRIM'
+    
     @staticmethod
-    def image_to_base64(image_path, max_size_kb=500):
-        """Конвертирует изображение в base64 с оптимизацией размера"""
+    def _encode_jpeg(img, quality):
+        """Сжимает изображение в JPEG с заданным качеством, возвращает буфер"""
+        buffer = BytesIO()
+        img.save(buffer, format='JPEG', quality=quality, optimize=True)
+        return buffer
+    
+    @staticmethod
+    def image_to_bytes(image_path, max_size_kb=500):
+        """Конвертирует изображение в JPEG с оптимизацией размера"""
         try:
             with Image.open(image_path) as img:
                 # Конвертируем в RGB если нужно
                 if img.mode in ('RGBA', 'LA'):
                     background = Image.new('RGB', img.size, (255, 255, 255))
-                    background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
+                    mask = img.getchannel('A') if img.mode == 'RGBA' else None
+                    background.paste(img, mask=mask)
                     img = background
                 
+                # Уменьшаем большие изображения: это сокращает работу кодера
+                # квадратично и обычно позволяет обойтись одним сжатием
+                if max(img.size) > 1500:
+                    img.thumbnail((1500, 1500), Image.LANCZOS)
+                
                 # Оптимизируем размер для QR-кода
+                # Размер проверяем по самому буферу (без копирования),
+                # байты копируются один раз - из итогового буфера
                 quality = 85
-                while True:
-                    # Сохраняем во временный буфер для проверки размера
-                    from io import BytesIO
-                    buffer = BytesIO()
-                    img.save(buffer, format='JPEG', quality=quality, optimize=True)
-                    size_kb = len(buffer.getvalue()) // 1024
-                    
-                    if size_kb <= max_size_kb or quality <= 10:
-                        break
-                    quality -= 15
+                buffer = ImageEncoder._encode_jpeg(img, quality)
+                size_kb = len(buffer.getbuffer()) // 1024
                 
-                # Получаем финальные данные
-                buffer.seek(0)
-                image_data = buffer.getvalue()
-                
-                # Кодируем в base64
-                base64_data = base64.b64encode(image_data).decode('utf-8')
+                if size_kb > max_size_kb:
+                    # Размер JPEG почти линейно зависит от качества: сразу
+                    # оцениваем подходящее качество, а если не хватило -
+                    # делим пополам интервал до минимального качества
+                    estimate = max(10, int(quality * (max_size_kb / size_kb) ** 0.9))
+                    for quality in (estimate, (estimate + 10) // 2, 10):
+                        buffer = ImageEncoder._encode_jpeg(img, quality)
+                        size_kb = len(buffer.getbuffer()) // 1024
+                        
+                        if size_kb <= max_size_kb or quality <= 10:
+                            break
                 
                 print(f"📊 Размер изображения: {size_kb} KB, качество: {quality}%")
-                return f"data:image/jpeg;base64,{base64_data}"
+                return buffer.getvalue()
                 
         except Exception as e:
             raise Exception(f"Ошибка обработки изображения: {e}")
     
     @staticmethod
     def encrypt_data(data, password):
-        """Шифрует данные с использованием AES"""
+        """Шифрует байты с использованием AES"""
         try:
-            # Генерируем ключ из пароля
-            key = hashlib.sha256(password.encode()).digest()
-            
-            # Генерируем случайный IV
-            iv = get_random_bytes(16)
-            
-            # Создаем шифр
-            cipher = AES.new(key, AES.MODE_CBC, iv)
-            
-            # Шифруем данные
-            encrypted_data = cipher.encrypt(pad(data.encode(), AES.block_size))
-            
-            # Комбинируем IV + зашифрованные данные
-            result = iv + encrypted_data
+            # Шифруем ключом пароля (GCM: без дополнения и с проверкой
+            # целостности), результат - nonce + тег + зашифрованные данные
+            result = _gcm_encrypt(data, password)
             
             # Кодируем в base64
-            return base64.b64encode(result).decode('utf-8')
+            return _b64encode(result).decode('utf-8')
             
         except Exception as e:
             raise Exception(f"Ошибка шифрования: {e}")
     
     @staticmethod
     def decrypt_data(encrypted_data, password):
-        """Расшифровывает данные"""
+        """Расшифровывает данные, возвращает байты"""
         try:
             # Декодируем из base64
-            encrypted_bytes = base64.b64decode(encrypted_data)
-            
-            # Извлекаем IV и зашифрованные данные
-            iv = encrypted_bytes[:16]
-            encrypted_bytes = encrypted_bytes[16:]
-            
-            # Генерируем ключ
-            key = hashlib.sha256(password.encode()).digest()
-            
-            # Создаем шифр для расшифровки
-            cipher = AES.new(key, AES.MODE_CBC, iv)
+            encrypted_bytes = _b64decode(encrypted_data)
             
-            # Расшифровываем
-            decrypted_data = unpad(cipher.decrypt(encrypted_bytes), AES.block_size)
-            
-            return decrypted_data.decode('utf-8')
+            # Расшифровываем и проверяем тег
+            return _gcm_decrypt(encrypted_bytes, password)
             
         except Exception as e:
             raise Exception(f"Ошибка расшифровки: {e}")
     
     @staticmethod
     def compress_data(data):
-        """Сжимает данные"""
-        return base64.b64encode(zlib.compress(data.encode())).decode('utf-8')
+        """Сжимает байты, возвращает base64 в виде байтов.
+        
+        Строка не нужна: байты уходят в QR-код как есть, в байтовом режиме.
+        """
+        return _b64encode(_ZSTD_DICT_MARKER + _ZSTD_COMPRESSOR.compress(data))
     
     @staticmethod
     def decompress_data(compressed_data):
-        """Распаковывает данные"""
-        return zlib.decompress(base64.b64decode(compressed_data)).decode('utf-8')
+        """Распаковывает данные (base64 в байтах или строке), возвращает байты"""
+        payload = _b64decode(compressed_data)
+        
+        # Без маркера - обычный кадр zstd (сжато без словаря)
+        if payload[:1] == _ZSTD_DICT_MARKER:
+            return _ZSTD_DICT_DECOMPRESSOR.decompress(payload[1:])
+        return _ZSTD_DECOMPRESSOR.decompress(payload)
+
+def _render_qr(data, filename, settings):
+    """Кодирует данные в QR-код и сохраняет изображение в файл.
+    
+    Функция верхнего уровня, чтобы ее можно было выполнять в пуле процессов.
+    """
+    # Двоичные данные кодируем как есть, в байтовом режиме
+    qr = segno.make_qr(
+        data,
+        error='h',
+        mode='byte' if isinstance(data, bytes) else None,
+    )
+    
+    # Матрица модулей (с рамкой) -> пиксели: каждый модуль становится
+    # квадратом box_size x box_size, без попиксельного цикла на Python
+    box_size = settings['box_size']
+    modules = np.array(list(qr.matrix_iter(scale=1, border=4)), dtype=np.uint8)
+    modules = modules.repeat(box_size, axis=0).repeat(box_size, axis=1)
+    
+    # Двухцветное изображение с палитрой: 0 - фон, 1 - модуль
+    qr_img = Image.fromarray(modules)
+    qr_img.putpalette(ImageColor.getrgb(settings['bg_color'])[:3]
+                      + ImageColor.getrgb(settings['fill_color'])[:3])
+    
+    # JPEG и ряд других форматов не поддерживают палитру
+    if Path(filename).suffix.lower() not in ('.png', '.gif'):
+        qr_img = qr_img.convert('RGB')
+    
+    qr_img.save(filename)
+
 
 class QRCodeGenerator:
     """Основной класс генератора QR-кодов"""
@@ -182,7 +300,7 @@ class QRCodeGenerator:
             '7': {'name': '📍 Геолокация', 'handler': self.create_geo_qr},
             '8': {'name': '📞 Телефон', 'handler': self.create_phone_qr},
             '9': {'name': '📅 Событие', 'handler': self.create_event_qr},
-            '10': {'name': '🖼️ Изображение (Base64)', 'handler': self.create_image_qr},
+            '10': {'name': '🖼️ Изображение (JPEG)', 'handler': self.create_image_qr},
             '11': {'name': '🔐 Зашифрованное изображение', 'handler': self.create_encrypted_image_qr},
             '12': {'name': '📁 Файл (текстовый)', 'handler': self.create_file_qr}
         }
@@ -222,7 +340,6 @@ class QRCodeGenerator:
                     return default
             else:
                 if password:
-                    import getpass
                     user_input = getpass.getpass(f"{prompt}: ")
                 else:
                     user_input = input(f"{prompt}: ").strip()
@@ -418,7 +535,7 @@ class QRCodeGenerator:
         return event_data, filename
     
     def create_image_qr(self):
-        """Создает QR-код с изображением в base64"""
+        """Создает QR-код с изображением (заголовок QRIM + длина + байты JPEG)"""
         print("\n🖼️ СОЗДАНИЕ QR-КОДА С ИЗОБРАЖЕНИЕМ")
         print("-" * 30)
         
@@ -429,18 +546,12 @@ class QRCodeGenerator:
             return None, None
         
         try:
-            # Конвертируем изображение в base64
-            base64_image = self.encoder.image_to_base64(image_path)
-            
-            # Создаем JSON с метаданными
-            image_data = {
-                "type": "image",
-                "format": "jpeg",
-                "data": base64_image,
-                "timestamp": datetime.now().isoformat()
-            }
+            # Сжимаем изображение в JPEG
+            image_data = self.encoder.image_to_bytes(image_path)
             
-            data = json.dumps(image_data, ensure_ascii=False)
+            # Кладем в QR-код сырые байты JPEG с коротким заголовком вместо
+            # base64 внутри JSON: полезных данных на треть меньше
+            data = ImageEncoder.IMAGE_MAGIC + struct.pack('>I', len(image_data)) + image_data
             filename = self.get_input("Имя файла для сохранения", required=False, default="image_qr.png")
             
             return data, filename
@@ -467,16 +578,17 @@ class QRCodeGenerator:
             return None, None
         
         try:
-            # Конвертируем изображение в base64
-            base64_image = self.encoder.image_to_base64(image_path, max_size_kb=300)
+            # Сжимаем изображение в JPEG
+            image_data = self.encoder.image_to_bytes(image_path, max_size_kb=300)
             
-            # Шифруем данные
-            encrypted_data = self.encoder.encrypt_data(base64_image, password)
+            # Шифруем сами байты JPEG: в base64 кодируется только шифротекст
+            encrypted_data = self.encoder.encrypt_data(image_data, password)
             
             # Создаем JSON с метаданными
             encrypted_package = {
                 "type": "encrypted_image",
-                "algorithm": "AES-256-CBC",
+                "algorithm": "AES-256-GCM",
+                "format": "jpeg",
                 "data": encrypted_data,
                 "timestamp": datetime.now().isoformat()
             }
@@ -503,14 +615,20 @@ class QRCodeGenerator:
             return None, None
         
         try:
-            # Читаем файл
-            with open(file_path, 'r', encoding='utf-8') as f:
-                file_content = f.read()
+            # Читаем не больше, чем нужно на 10000 символов (до 4 байт UTF-8 на символ)
+            max_chars = 10000  # Ограничение для QR-кода
+            max_bytes = max_chars * 4
+            file_size = os.path.getsize(file_path)
+            with open(file_path, 'rb') as f:
+                raw = f.read(min(file_size, max_bytes))
+            # Переводы строк \r\n и \r приводим к \n, как делал текстовый режим
+            file_content = raw.decode('utf-8', 'replace')
+            file_content = file_content.replace('\r\n', '\n').replace('\r', '\n')
             
             # Проверяем размер
-            if len(file_content) > 10000:  # Ограничение для QR-кода
+            if file_size > max_bytes or len(file_content) > max_chars:
                 print("⚠️ Файл слишком большой для QR-кода. Будут использованы первые 10000 символов.")
-                file_content = file_content[:10000]
+                file_content = file_content[:max_chars]
             
             # Создаем JSON с метаданными
             file_data = {
@@ -530,8 +648,8 @@ class QRCodeGenerator:
             return None, None
     
     def url_encode(self, text):
-        """Простое URL кодирование"""
-        return text.replace(' ', '%20').replace('&', '%26')
+        """URL кодирование (все зарезервированные символы и не-ASCII)"""
+        return quote(text, safe='')
     
     def get_qr_settings(self):
         """Получает настройки для QR-кода"""
@@ -595,24 +713,7 @@ class QRCodeGenerator:
             return False
             
         try:
-            # Создаем QR-код
-            qr = qrcode.QRCode(
-                version=None,
-                error_correction=qrcode.constants.ERROR_CORRECT_H,
-                box_size=settings['box_size'],
-                border=4,
-            )
-            qr.add_data(data)
-            qr.make(fit=True)
-            
-            # Создаем изображение
-            qr_img = qr.make_image(
-                fill_color=settings['fill_color'],
-                back_color=settings['bg_color']
-            )
-            
-            # Сохраняем
-            qr_img.save(filename)
+            _render_qr(data, filename, settings)
             
             # Показываем информацию о файле
             file_size = os.path.getsize(filename) // 1024
@@ -626,7 +727,10 @@ class QRCodeGenerator:
             print(f"🎨 Цвета: QR-код {settings['fill_color']}, фон {settings['bg_color']}")
             
             # Показываем превью в консоли (упрощенное)
-            preview = data[:100] + "..." if len(data) > 100 else data
+            if isinstance(data, bytes):
+                preview = f"<двоичные данные, {len(data)} байт>"
+            else:
+                preview = data[:100] + "..." if len(data) > 100 else data
             print(f"\n👀 Превью данных: {preview}")
             
             return True
@@ -635,6 +739,30 @@ class QRCodeGenerator:
             print(f"❌ Ошибка при создании QR-кода: {e}")
             return False
     
+    def generate_many(self, jobs):
+        """Генерирует пачку QR-кодов параллельно в нескольких процессах.
+        
+        jobs - последовательность кортежей (data, filename, settings).
+        Возвращает список флагов успеха в том же порядке.
+        """
+        jobs = list(jobs)
+        results = []
+        
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = [executor.submit(_render_qr, data, filename, settings)
+                       for data, filename, settings in jobs]
+            
+            for (data, filename, settings), future in zip(jobs, futures):
+                try:
+                    future.result()
+                    results.append(True)
+                except Exception as e:
+                    print(f"❌ Ошибка при создании QR-кода {filename}: {e}")
+                    results.append(False)
+        
+        print(f"\n✅ Создано QR-кодов: {sum(results)} из {len(jobs)}")
+        return results
+    
     def main_menu(self):
         """Главное меню программы"""
         while True:
@@ -701,8 +829,8 @@ class QRCodeGenerator:
             
             # Демонстрация работы с шифрованием
             test_data = "Тестовые данные для демонстрации"
-            encrypted = self.encoder.encrypt_data(test_data, password)
-            decrypted = self.encoder.decrypt_data(encrypted, password)
+            encrypted = self.encoder.encrypt_data(test_data.encode(), password)
+            decrypted = self.encoder.decrypt_data(encrypted, password).decode('utf-8')
             
             print(f"\n🔐 Демонстрация шифрования:")
             print(f"📤 Исходные данные: {test_data}")